@@ -9,6 +9,7 @@ including loading configuration from environment variables and files.
 import logging
 import os
 import json
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 
@@ -51,6 +52,11 @@ class AgentConfig:
     rate_limit_requests: int = 10
     rate_limit_window: int = 60
     api_keys: List[str] = field(default_factory=list)
+    
+    # Caching configuration
+    enable_caching: bool = True
+    cache_ttl: int = 3600  # 1 hour
+    redis_url: str = ""
 
 def load_config_from_env() -> AgentConfig:
     """
@@ -105,20 +111,27 @@ def load_config_from_env() -> AgentConfig:
     if api_keys_str:
         config.api_keys = api_keys_str.split(",")
     
+    # Caching configuration
+    config.enable_caching = os.getenv("ENABLE_CACHING", "true").lower() == "true"
+    config.cache_ttl = int(os.getenv("CACHE_TTL", "3600"))
+    config.redis_url = os.getenv("REDIS_URL", "")
+    
     return config
 
 _config: Optional[AgentConfig] = None
 
+@lru_cache(maxsize=1)
 def get_config() -> AgentConfig:
     """
     Get the configuration.
     
+    The result is cached, so environment variables are only parsed once.
+    
     Returns:
         An AgentConfig instance
     """
-    global _config
     if _config is None:
-        _config = load_config_from_env()
+        return load_config_from_env()
     return _config
 
 def set_config(config: AgentConfig) -> None:
@@ -130,3 +143,4 @@ def set_config(config: AgentConfig) -> None:
     """
     global _config
     _config = config
+    get_config.cache_clear()
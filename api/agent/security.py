@@ -7,66 +7,21 @@ output sanitization, and rate limiting.
 """
 
 import logging
-import re
 import time
-from typing import Dict, Any, Optional
-import html
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Any, Optional
 import hashlib
 
+from ..sanitizer import MAX_INPUT_LENGTH, sanitize_input, sanitize_output
+
 logger = logging.getLogger(__name__)
 
-# Rate limiting storage
-rate_limits: Dict[str, Dict[str, Any]] = {}
+# Rate limiting storage: request times per client, oldest first, with the
+# least recently seen client first
+rate_limits: "OrderedDict[str, Deque[float]]" = OrderedDict()
 
-def sanitize_input(text: str) -> str:
-    """
-    Sanitize user input to prevent injection attacks.
-    
-    Args:
-        text: Input text to sanitize
-        
-    Returns:
-        Sanitized text
-    """
-    if not text:
-        return ""
-    
-    # Remove potentially dangerous patterns
-    # Remove HTML/XML tags
-    text = re.sub(r'<[^>]*>', '', text)
-    
-    # Remove potential SQL injection patterns
-    text = re.sub(r'(\b(SELECT|INSERT|UPDATE|DELETE|DROP|ALTER|UNION|CREATE|WHERE)\b)', 
-                 lambda match: match.group(1).lower(), text, flags=re.IGNORECASE)
-    
-    # Remove potential command injection patterns
-    text = re.sub(r'(;|\||\$\(|\`)', ' ', text)
-    
-    # Limit length
-    max_length = 4000
-    if len(text) > max_length:
-        text = text[:max_length]
-        logger.warning(f"Input text truncated to {max_length} characters")
-    
-    return text
-
-def sanitize_output(text: str) -> str:
-    """
-    Sanitize output to prevent XSS and other attacks.
-    
-    Args:
-        text: Output text to sanitize
-        
-    Returns:
-        Sanitized text
-    """
-    if not text:
-        return ""
-    
-    # Escape HTML entities
-    text = html.escape(text)
-    
-    return text
+# Most clients tracked at once; the least recently seen is evicted beyond this
+RATE_LIMIT_MAX_CLIENTS = 10000
 
 def check_rate_limit(client_id: str, limit: int = 10, window: int = 60) -> bool:
     """
@@ -80,32 +35,47 @@ def check_rate_limit(client_id: str, limit: int = 10, window: int = 60) -> bool:
     Returns:
         True if rate limit is not exceeded, False otherwise
     """
-    current_time = time.time()
-    
-    # Initialize rate limit entry if not exists
-    if client_id not in rate_limits:
-        rate_limits[client_id] = {
-            "count": 0,
-            "reset_time": current_time + window
-        }
-    
-    # Reset count if window has passed
-    if current_time > rate_limits[client_id]["reset_time"]:
-        rate_limits[client_id] = {
-            "count": 0,
-            "reset_time": current_time + window
-        }
+    current_time = time.monotonic()
+    cutoff = current_time - window
+    
+    timestamps = rate_limits.get(client_id)
+    if timestamps is None:
+        _evict_idle_clients(cutoff)
+        if len(rate_limits) >= RATE_LIMIT_MAX_CLIENTS:
+            rate_limits.popitem(last=False)
+        timestamps = rate_limits[client_id] = deque()
+    else:
+        rate_limits.move_to_end(client_id)
+    
+    # Drop requests that have left the window
+    while timestamps and timestamps[0] <= cutoff:
+        timestamps.popleft()
     
     # Check if limit is exceeded
-    if rate_limits[client_id]["count"] >= limit:
-        logger.warning(f"Rate limit exceeded for client {client_id}")
+    if len(timestamps) >= limit:
+        logger.warning("Rate limit exceeded for client %s", client_id)
         return False
     
-    # Increment count
-    rate_limits[client_id]["count"] += 1
+    timestamps.append(current_time)
     
     return True
 
+def _evict_idle_clients(cutoff: float) -> None:
+    """
+    Remove idle clients from the least recently seen end of rate_limits.
+    
+    Stops at the first client with a request after cutoff, so the cost is
+    proportional to the number of clients removed.
+    
+    Args:
+        cutoff: Monotonic time before which requests no longer count
+    """
+    while rate_limits:
+        timestamps = next(iter(rate_limits.values()))
+        if timestamps and timestamps[-1] > cutoff:
+            break
+        rate_limits.popitem(last=False)
+
 def generate_client_id(ip_address: str, user_agent: str) -> str:
     """
     Generate a client ID from IP address and user agent.
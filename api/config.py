@@ -9,7 +9,7 @@ including loading configuration from environment variables.
 import os
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional
+from typing import Dict, FrozenSet, List, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +38,7 @@ class AppConfig:
     host: str = "0.0.0.0"
     
     # Security configuration
-    api_keys: List[str] = field(default_factory=list)
+    api_keys: FrozenSet[str] = frozenset()
     rate_limit_requests: int = 10
     rate_limit_window: int = 60
     cors_origins: List[str] = field(default_factory=list)
@@ -98,7 +98,7 @@ def load_config() -> AppConfig:
     # Security configuration
     api_keys_str = os.getenv("API_KEYS", "")
     if api_keys_str:
-        config.api_keys = api_keys_str.split(",")
+        config.api_keys = frozenset(api_keys_str.split(","))
     config.rate_limit_requests = int(os.getenv("RATE_LIMIT_REQUESTS", "10"))
     config.rate_limit_window = int(os.getenv("RATE_LIMIT_WINDOW", "60"))
     
@@ -5,24 +5,29 @@ Main entry point for the Launch AI Generator application.
 This module provides the FastAPI application and routes for the web interface.
 """
 
+import asyncio
 import logging
 import os
-import datetime
+import re
+import time
 import uuid
-import json
-from pathlib import Path
-import traceback
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path, PurePath
 
 from fastapi import FastAPI, Request, Form, File, UploadFile, HTTPException, Depends
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import aiofiles
+import aiohttp
 import httpx
+import orjson
 
 # Import agent routes
 from .agent_routes import router as agent_router
 from .agent import get_config
+from .llm_cache import create_cache, make_cache_key
 
 # Configure logging
 logging.basicConfig(
@@ -34,11 +39,46 @@ logger = logging.getLogger(__name__)
 # Load configuration
 config = get_config()
 
+# Cache for generated responses
+llm_cache = create_cache(config.redis_url)
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared outbound HTTP client, creating it if lifespan has not run"""
+    client = getattr(app.state, "http_client", None)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+        app.state.http_client = client
+    return client
+
+def get_aio_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session used for Together completions"""
+    session = getattr(app.state, "aio_session", None)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=60),
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=50, keepalive_timeout=60)
+        )
+        app.state.aio_session = session
+    return session
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared HTTP clients on startup and close them on shutdown"""
+    get_http_client()
+    get_aio_session()
+    yield
+    await app.state.http_client.aclose()
+    await app.state.aio_session.close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Launch AI Generator",
     description="AI-powered application generator",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Include agent routes
@@ -60,6 +100,15 @@ VERSIONS_DIR = TMP_DIR / "versions"
 UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
 VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Uploads are copied to disk in chunks of this size rather than read whole
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Largest screenshot upload accepted, in bytes
+MAX_UPLOAD_SIZE = 10 << 20
+
+# Characters replaced in client-supplied upload filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]")
+
 # Enhanced system prompt
 SYSTEM_PROMPT = """<thoughts>
 Analyze user intent deeply. Consider the technical requirements, architecture, and potential challenges.
@@ -606,6 +655,12 @@ Review the generated code for:
 Fix any issues before finalizing output.
 </critique>"""
 
+# Upper bound on how much of an upstream error body is read and parsed
+ERROR_BODY_LIMIT = 4096
+
+# Cap on concurrent in-flight Together requests from /api/generate
+TOGETHER_SEM = asyncio.Semaphore(int(os.getenv("TOGETHER_CONCURRENCY", "16")))
+
 # Project templates
 PROJECT_TEMPLATES = {
     "landing_page": "Create a responsive landing page with hero section, features, and call-to-action",
@@ -616,6 +671,35 @@ PROJECT_TEMPLATES = {
     "e_commerce": "Build an e-commerce product page with cart functionality"
 }
 
+@lru_cache(maxsize=1)
+def _utc_second_iso(second):
+    """Format an epoch second as an ISO-8601 UTC string (cached for the current second)"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+
+def utc_now_iso():
+    """Return the current UTC time as ISO-8601 with millisecond precision"""
+    ms = time.time_ns() // 1_000_000
+    return f"{_utc_second_iso(ms // 1000)}.{ms % 1000:03d}"
+
+@lru_cache(maxsize=1)
+def _utc_second_compact(second):
+    """Format an epoch second as YYYYmmddHHMMSS in UTC (cached for the current second)"""
+    return time.strftime("%Y%m%d%H%M%S", time.gmtime(second))
+
+def new_version_timestamp():
+    """Return a sortable UTC version key with microsecond precision"""
+    us = time.time_ns() // 1000
+    return f"{_utc_second_compact(us // 1_000_000)}_{us % 1_000_000:06d}"
+
+# Recently read versions (metadata and code), keyed by timestamp
+_VERSION_CACHE = OrderedDict()
+VERSION_CACHE_SIZE = 256
+
+def _write_version_sync(timestamp, info_bytes, code_bytes):
+    """Write a version's metadata and code files in one worker-thread hop"""
+    (VERSIONS_DIR / f"{timestamp}.json").write_bytes(info_bytes)
+    (VERSIONS_DIR / f"{timestamp}.html").write_bytes(code_bytes)
+
 # Version tracking (serverless-friendly)
 async def save_version(code, prompt, timestamp, template=None, model=None):
     """Save version information to a JSON file in the tmp directory"""
@@ -625,90 +709,150 @@ async def save_version(code, prompt, timestamp, template=None, model=None):
         "prompt": prompt[:100] + ("..." if len(prompt) > 100 else ""),
         "template": template,
         "model": model,
-        "date": datetime.datetime.utcnow().isoformat()
+        "date": utc_now_iso()
     }
     
-    version_file = VERSIONS_DIR / f"{timestamp}.json"
-    async with aiofiles.open(version_file, "w") as f:
-        await f.write(json.dumps(version_info))
-    
-    code_file = VERSIONS_DIR / f"{timestamp}.html"
-    async with aiofiles.open(code_file, "w") as f:
-        await f.write(code)
+    await asyncio.to_thread(
+        _write_version_sync,
+        timestamp,
+        orjson.dumps(version_info),
+        code.encode("utf-8")
+    )
+    # Drop any cached copy in case an existing version is being overwritten
+    _VERSION_CACHE.pop(timestamp, None)
     
     return version_info
 
+def _read_versions_sync():
+    """Load the metadata of every saved version"""
+    versions = []
+    for filename in os.listdir(VERSIONS_DIR):
+        if filename.endswith(".json"):
+            versions.append(orjson.loads((VERSIONS_DIR / filename).read_bytes()))
+    return versions
+
 async def get_versions():
     """Get all saved versions"""
-    versions = []
     try:
-        for filename in os.listdir(VERSIONS_DIR):
-            if filename.endswith(".json"):
-                async with aiofiles.open(VERSIONS_DIR / filename, "r") as f:
-                    content = await f.read()
-                    version_info = json.loads(content)
-                    versions.append(version_info)
+        versions = await asyncio.to_thread(_read_versions_sync)
         return sorted(versions, key=lambda x: x["timestamp"], reverse=True)
     except Exception as e:
-        logger.error(f"Error getting versions: {e}")
+        logger.error("Error getting versions: %s", e)
         return []
 
-async def generate_with_together(prompt, system_message=None):
-    """Generate text using Together AI API"""
-    if not config.together_api_key:
-        logger.error("Together API key not configured")
-        raise HTTPException(status_code=500, detail="Together API key not configured")
+@lru_cache(maxsize=None)
+def _system_prompt_json(template=None):
+    """
+    JSON-encode SYSTEM_PROMPT plus the optional template context once.
+    
+    The closing quote is dropped so the encoded user request can be appended
+    to form a complete JSON string.
+    """
+    template_context = f"\nTemplate: {PROJECT_TEMPLATES[template]}\n" if template else ""
+    return orjson.dumps(f"{SYSTEM_PROMPT}{template_context}")[:-1]
+
+@lru_cache(maxsize=1)
+def _together_request_template(api_key, model_name, temperature, max_tokens):
+    """
+    Build the constant parts of a Together chat request.
     
+    Returns the headers and the serialized payload without its closing brace,
+    so callers only need to append the messages. The cache is keyed on the
+    config values, so a config change rebuilds it on the next call.
+    """
     headers = {
-        "Authorization": f"Bearer {config.together_api_key}",
+        "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json"
     }
+    payload_prefix = orjson.dumps({
+        "model": model_name,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    })[:-1]
+    return headers, payload_prefix
+
+async def _read_error_body(response, limit=ERROR_BODY_LIMIT):
+    """Read at most `limit` bytes of an upstream error response body"""
+    body = b""
+    while len(body) < limit:
+        chunk = await response.content.readany()
+        if not chunk:
+            break
+        body += chunk
+    return body[:limit]
+
+async def generate_with_together(prompt, system_message=None, session=None):
+    """
+    Generate text using Together AI API.
+    
+    `system_message` may be a str or bytes that are already a JSON-encoded
+    string, such as the output of `_system_prompt_json`. Requests go through
+    the shared aiohttp session unless `session` is given.
+    """
+    if not config.together_api_key:
+        logger.error("Together API key not configured")
+        raise HTTPException(status_code=500, detail="Together API key not configured")
     
-    messages = []
+    headers, payload_prefix = _together_request_template(
+        config.together_api_key,
+        config.model_name,
+        config.temperature,
+        config.max_tokens
+    )
+    
+    messages = orjson.dumps({"role": "user", "content": prompt})
     if system_message:
-        messages.append({"role": "system", "content": system_message})
+        if isinstance(system_message, str):
+            system_message = orjson.dumps(system_message)
+        messages = b'{"role":"system","content":' + system_message + b"}," + messages
     
-    messages.append({"role": "user", "content": prompt})
+    payload = payload_prefix + b',"messages":[' + messages + b"]}"
     
-    payload = {
-        "model": config.model_name,
-        "messages": messages,
-        "temperature": config.temperature,
-        "max_tokens": config.max_tokens
-    }
+    logger.info("Sending request to Together API with model: %s", config.model_name)
     
-    logger.info(f"Sending request to Together API with model: {config.model_name}")
+    if session is None:
+        session = get_aio_session()
     
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        try:
-            response = await client.post(
-                "https://api.together.xyz/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            
-            if response.status_code != 200:
-                error_detail = f"Together API returned status code {response.status_code}"
+    try:
+        async with session.post(
+            "https://api.together.xyz/v1/chat/completions",
+            headers=headers,
+            data=payload
+        ) as response:
+            if response.status != 200:
+                error_detail = f"Together API returned status code {response.status}"
+                error_body = await _read_error_body(response)
                 try:
-                    error_json = response.json()
+                    error_json = orjson.loads(error_body)
                     if "error" in error_json:
                         error_detail += f": {error_json['error'].get('message', '')}"
                 except:
-                    error_detail += f": {response.text[:100]}"
+                    error_detail += f": {error_body[:100].decode('utf-8', 'replace')}"
                 
                 logger.error(error_detail)
                 raise HTTPException(status_code=500, detail=error_detail)
             
-            result = response.json()
+            result = orjson.loads(await response.read())
             return result["choices"][0]["message"]["content"]
-        except httpx.RequestError as e:
-            error_msg = f"Error connecting to Together API: {str(e)}"
-            logger.error(error_msg)
-            raise HTTPException(status_code=500, detail=error_msg)
-        except Exception as e:
-            error_msg = f"Error calling Together API: {str(e)}"
-            logger.error(f"{error_msg}\n{traceback.format_exc()}")
-            raise HTTPException(status_code=500, detail=error_msg)
+    except aiohttp.ClientError as e:
+        error_msg = f"Error connecting to Together API: {str(e)}"
+        logger.error(error_msg)
+        raise HTTPException(status_code=500, detail=error_msg)
+    except Exception as e:
+        error_msg = f"Error calling Together API: {str(e)}"
+        logger.error("Error calling Together API: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=error_msg)
+
+_prompt_engineer = None
+
+def get_prompt_engineer():
+    """Return the shared PromptEngineer, importing LangChain on first use"""
+    global _prompt_engineer
+    if _prompt_engineer is None:
+        from .prompt_engineering import PromptEngineer
+        
+        _prompt_engineer = PromptEngineer()
+    return _prompt_engineer
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
@@ -719,29 +863,48 @@ async def index(request: Request):
 async def generate(prompt: str = Form(...), template: str = Form(None), model: str = Form("together")):
     """Generate code based on user prompt"""
     try:
-        logger.info(f"Received generate request with prompt: {prompt[:50]}...")
+        logger.info("Received generate request with prompt: %.50s...", prompt)
         
         if not prompt:
             raise HTTPException(status_code=400, detail="Missing prompt")
 
         # Add template context if provided
-        template_context = ""
+        template_key = None
         if template and template in PROJECT_TEMPLATES:
-            template_context = f"\nTemplate: {PROJECT_TEMPLATES[template]}\n"
-            logger.info(f"Using template: {template}")
+            template_key = template
+            logger.info("Using template: %s", template)
 
-        # Compose full prompt
-        full_prompt = f"{SYSTEM_PROMPT}{template_context}\n<user_request>{prompt}</user_request>"
+        # Compose full prompt; only the user request needs encoding per call
+        full_prompt = _system_prompt_json(template_key) + orjson.dumps(
+            f"\n<user_request>{prompt}</user_request>"
+        )[1:]
         
-        # Generate code using Together AI
-        logger.info("Calling Together API...")
-        generated_code = await generate_with_together(prompt, full_prompt)
-        logger.info(f"Received response from Together API: {len(generated_code)} characters")
+        # Serve identical requests from the LLM cache. Only deterministic
+        # (temperature 0) generations are cached, so sampled output still
+        # varies when a user regenerates the same prompt.
+        use_cache = config.enable_caching and config.temperature == 0
+        generated_code = None
+        if use_cache:
+            cache_key = make_cache_key(
+                config.model_name, template_key, prompt, config.temperature, config.max_tokens
+            )
+            generated_code = await llm_cache.get(cache_key)
+        
+        if generated_code is None:
+            # Generate code using Together AI
+            logger.info("Calling Together API...")
+            async with TOGETHER_SEM:
+                generated_code = await generate_with_together(prompt, full_prompt)
+            logger.info("Received response from Together API: %d characters", len(generated_code))
+            if use_cache:
+                await llm_cache.set(cache_key, generated_code, config.cache_ttl)
+        else:
+            logger.info("Serving cached response: %d characters", len(generated_code))
         
         # Save version
-        timestamp = datetime.datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        timestamp = new_version_timestamp()
         version_info = await save_version(generated_code, prompt, timestamp, template, model)
-        logger.info(f"Saved version with timestamp: {timestamp}")
+        logger.info("Saved version with timestamp: %s", timestamp)
         
         return {
             "generated": generated_code, 
@@ -750,9 +913,67 @@ async def generate(prompt: str = Form(...), template: str = Form(None), model: s
         }
     
     except Exception as e:
-        logger.error(f"Error in generate endpoint: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in generate endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/generate/stream")
+async def generate_stream(prompt: str = Form(...), template: str = Form(None), model: str = Form("together")):
+    """Stream generated code as server-sent events"""
+    if not prompt:
+        raise HTTPException(status_code=400, detail="Missing prompt")
+    
+    template_context = ""
+    if template and template in PROJECT_TEMPLATES:
+        template_context = f"Template: {PROJECT_TEMPLATES[template]}"
+        logger.info("Using template: %s", template)
+    
+    try:
+        engineer = get_prompt_engineer()
+    except Exception as e:
+        logger.error("Error initializing prompt engineer: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    timestamp = new_version_timestamp()
+    
+    async def event_stream():
+        chunks = []
+        yield b"data: " + orjson.dumps({"timestamp": timestamp}) + b"\n\n"
+        try:
+            async for chunk in engineer.stream_raw_code_generation(prompt, additional_context=template_context):
+                chunks.append(chunk)
+                yield b"data: " + orjson.dumps({"chunk": chunk}) + b"\n\n"
+            yield b"data: " + orjson.dumps({"done": True}) + b"\n\n"
+        except Exception as e:
+            logger.error("Error in generate stream: %s", e, exc_info=True)
+            yield b"data: " + orjson.dumps({"error": str(e)}) + b"\n\n"
+        finally:
+            # Save whatever was generated once the stream closes, recording
+            # the provider that actually generated it
+            if chunks:
+                await asyncio.shield(save_version("".join(chunks), prompt, timestamp, template, engineer.provider))
+                logger.info("Saved version with timestamp: %s", timestamp)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+def _copy_upload_sync(src, dest_path):
+    """
+    Copy an uploaded file to disk in UPLOAD_CHUNK_SIZE pieces.
+    
+    Returns False, and removes the partial file, if the upload is larger
+    than MAX_UPLOAD_SIZE.
+    """
+    total = 0
+    with open(dest_path, "wb") as dst:
+        while chunk := src.read(UPLOAD_CHUNK_SIZE):
+            total += len(chunk)
+            if total > MAX_UPLOAD_SIZE:
+                break
+            dst.write(chunk)
+        else:
+            return True
+    dest_path.unlink()
+    return False
+
 @app.post("/api/screenshot")
 async def screenshot(image: UploadFile = File(...)):
     """Process screenshot and generate UI based on it"""
@@ -760,13 +981,17 @@ async def screenshot(image: UploadFile = File(...)):
         if not image:
             raise HTTPException(status_code=400, detail="No image provided")
         
+        # Reject early when the client declared the size
+        if image.size is not None and image.size > MAX_UPLOAD_SIZE:
+            raise HTTPException(status_code=413, detail="Image too large")
+        
         # Save the image
-        filename = f"{uuid.uuid4()}_{image.filename}"
+        safe_name = _UNSAFE_FILENAME_CHARS.sub("_", PurePath(image.filename or "upload").name)[:64]
+        filename = f"{uuid.uuid4().hex}_{safe_name}"
         image_path = UPLOADS_DIR / filename
         
-        async with aiofiles.open(image_path, "wb") as f:
-            content = await image.read()
-            await f.write(content)
+        if not await asyncio.to_thread(_copy_upload_sync, image.file, image_path):
+            raise HTTPException(status_code=413, detail="Image too large")
         
         # Generate UI from screenshot
         prompt = f"Create a modern, responsive UI implementation based on this screenshot. Provide clean, production-ready HTML, CSS, and JavaScript code."
@@ -774,8 +999,10 @@ async def screenshot(image: UploadFile = File(...)):
         # For now, return a placeholder response
         # In a real implementation, this would call an image-to-code model
         return {"image": "placeholder_image_data"}
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in screenshot endpoint: {str(e)}\n{traceback.format_exc()}")
+        logger.error("Error in screenshot endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/versions")
@@ -787,6 +1014,11 @@ async def versions():
 @app.get("/api/version/{timestamp}")
 async def get_version(timestamp: str):
     """Get a specific version"""
+    cached = _VERSION_CACHE.get(timestamp)
+    if cached is not None:
+        _VERSION_CACHE.move_to_end(timestamp)
+        return cached
+    
     try:
         version_file = VERSIONS_DIR / f"{timestamp}.json"
         code_file = VERSIONS_DIR / f"{timestamp}.html"
@@ -794,19 +1026,22 @@ async def get_version(timestamp: str):
         if not version_file.exists() or not code_file.exists():
             raise HTTPException(status_code=404, detail="Version not found")
             
-        async with aiofiles.open(version_file, "r") as f:
-            content = await f.read()
-            version_info = json.loads(content)
-            
-        async with aiofiles.open(code_file, "r") as f:
-            code = await f.read()
-            
-        return {
+        content, code = await asyncio.gather(
+            asyncio.to_thread(version_file.read_bytes),
+            asyncio.to_thread(code_file.read_text)
+        )
+        version_info = orjson.loads(content)
+        
+        result = {
             "version": version_info,
             "code": code
         }
+        _VERSION_CACHE[timestamp] = result
+        if len(_VERSION_CACHE) > VERSION_CACHE_SIZE:
+            _VERSION_CACHE.popitem(last=False)
+        return result
     except Exception as e:
-        logger.error(f"Error getting version: {str(e)}")
+        logger.error("Error getting version: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/health")
@@ -826,22 +1061,40 @@ async def health():
                 "Authorization": f"Bearer {config.together_api_key}",
                 "Content-Type": "application/json"
             }
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get("https://api.together.xyz/v1/models", headers=headers)
-                api_status["together_connection"] = "ok" if response.status_code == 200 else "error"
+            response = await get_http_client().get(
+                "https://api.together.xyz/v1/models",
+                headers=headers,
+                timeout=5.0
+            )
+            api_status["together_connection"] = "ok" if response.status_code == 200 else "error"
         except Exception as e:
             api_status["together_connection"] = f"error: {str(e)}"
     
     return api_status
 
+# /debug is disabled in production; the deployment environment is fixed per process
+_IS_PROD = os.environ.get("VERCEL_ENV") == "production"
+
+# Environment variable suffixes whose values are hidden by /debug
+SECRET_ENV_SUFFIXES = ("_KEY", "_SECRET")
+
+_redacted_env = None
+
+def get_redacted_env():
+    """Return the environment with secrets masked, computed once per process"""
+    global _redacted_env
+    if _redacted_env is None:
+        _redacted_env = {k: "***" if k.endswith(SECRET_ENV_SUFFIXES) else v
+                         for k, v in os.environ.items()}
+    return _redacted_env
+
 @app.get("/debug")
 async def debug():
     """Debug endpoint to check environment and configuration"""
-    if os.environ.get("VERCEL_ENV") != "production":
+    if not _IS_PROD:
         return {
             "python_version": os.sys.version,
-            "env_vars": {k: "***" if k.endswith("_KEY") or k.endswith("_SECRET") else v 
-                         for k, v in os.environ.items()},
+            "env_vars": get_redacted_env(),
             "together_key_set": bool(config.together_api_key),
             "langsmith_key_set": bool(config.langsmith_api_key),
             "tavily_key_set": bool(config.tavily_api_key),
@@ -0,0 +1,181 @@
+# @author likhonsheikh
+"""
+LLM response cache for Launch AI Generator.
+
+This module provides an exact-match cache for generated responses, keyed on
+the model, template and prompt, with an in-memory LRU backend and an optional
+Redis backend.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Protocol, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+class CacheBackend(Protocol):
+    """
+    Interface implemented by LLM cache backends.
+    """
+
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        ...
+
+class InMemoryCache:
+    """
+    Process-local LRU cache with per-entry expiry.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses to keep
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key
+            value: Response to cache
+            ttl: Time to live in seconds
+        """
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+class RedisCache:
+    """
+    Redis-backed cache shared between processes.
+
+    Requires the optional `redis` package. Redis errors are logged and
+    treated as cache misses so generation keeps working without the cache.
+    """
+
+    def __init__(self, url: str, prefix: str = "launch:llm:"):
+        """
+        Initialize the cache.
+
+        Args:
+            url: Redis connection URL
+            prefix: Prefix applied to every key
+        """
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached response, or None if missing or unavailable
+        """
+        try:
+            value = await self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("Redis cache get failed: %s", e)
+            return None
+        return value.decode("utf-8") if value is not None else None
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key
+            value: Response to cache
+            ttl: Time to live in seconds
+        """
+        try:
+            await self.client.set(self.prefix + key, value, ex=ttl)
+        except Exception as e:
+            logger.warning("Redis cache set failed: %s", e)
+
+def make_cache_key(
+    model: str,
+    template: Optional[str],
+    prompt: str,
+    temperature: float,
+    max_tokens: int
+) -> str:
+    """
+    Build the cache key for a generation request.
+
+    Args:
+        model: Model name used for generation
+        template: Project template key, if any
+        prompt: User prompt
+        temperature: Sampling temperature
+        max_tokens: Maximum number of generated tokens
+
+    Returns:
+        A hex SHA-256 digest
+    """
+    key_data = orjson.dumps(
+        {
+            "model": model,
+            "template": template,
+            "prompt": prompt,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        },
+        option=orjson.OPT_SORT_KEYS
+    )
+    return hashlib.sha256(key_data).hexdigest()
+
+def create_cache(redis_url: str = "") -> CacheBackend:
+    """
+    Create a cache backend.
+
+    Args:
+        redis_url: Redis connection URL; the in-memory cache is used if empty
+
+    Returns:
+        A cache backend instance
+    """
+    if redis_url:
+        try:
+            return RedisCache(redis_url)
+        except ImportError:
+            logger.warning("redis package not installed. Falling back to in-memory LLM cache.")
+    return InMemoryCache()
@@ -9,10 +9,12 @@ using LangSmith for evaluation and tracking.
 import logging
 import json
 import uuid
-from typing import Dict, List, Any, Optional, Union, AsyncGenerator
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple, Union, AsyncGenerator
 
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.schema import SystemMessage, HumanMessage, AIMessage
+from langchain.schema.runnable import Runnable
 from langchain_groq import ChatGroq
 from langchain_together import Together
 from langchain.smith import RunEvalConfig, run_on_dataset
@@ -20,6 +22,7 @@ from langchain.smith import arun_on_dataset
 from langchain.callbacks.tracers.langchain import wait_for_all_tracers
 from langchain.evaluation import EvaluatorType
 from langchain.evaluation.criteria import LabeledCriteriaEvalChain
+from langsmith import Client
 
 from .config import config
 from .security import sanitize_output
@@ -86,6 +89,34 @@ EVALUATION_CRITERIA = {
     "maintainability": "Is the code easy to understand, modify, and maintain?"
 }
 
+def _make_prompt_template(system_prompt: str) -> ChatPromptTemplate:
+    """
+    Build a chat prompt template around a system prompt.
+    
+    Args:
+        system_prompt: System prompt text
+        
+    Returns:
+        A ChatPromptTemplate instance
+    """
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=system_prompt),
+        MessagesPlaceholder(variable_name="chat_history"),
+        ("user", "{input}"),
+    ])
+
+# Templates for each prompt type without additional context, built at import
+DEFAULT_TEMPLATES = {
+    prompt_type: _make_prompt_template(system_prompt)
+    for prompt_type, system_prompt in SYSTEM_PROMPTS.items()
+}
+
+# Maximum number of composed chains kept per PromptEngineer
+CHAIN_CACHE_SIZE = 64
+
+# Number of examples sent per LangSmith create_examples request
+EXAMPLE_BATCH_SIZE = 100
+
 class PromptEngineer:
     """
     Manages prompt engineering for the Launch AI Generator.
@@ -96,7 +127,10 @@ class PromptEngineer:
     
     def __init__(self):
         """Initialize the PromptEngineer."""
+        self.provider = config.provider
         self.llm = self._initialize_llm()
+        self._ls_client = Client(api_key=config.langsmith_api_key) if config.langsmith_api_key else None
+        self._chain_cache: Dict[Tuple[str, str], Runnable] = {}
     
     def _initialize_llm(self):
         """
@@ -141,16 +175,44 @@ class PromptEngineer:
         Returns:
             A ChatPromptTemplate instance
         """
+        if not additional_context:
+            return DEFAULT_TEMPLATES.get(prompt_type, DEFAULT_TEMPLATES["default"])
+        
+        return self._build_prompt_template(prompt_type, additional_context)
+    
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _build_prompt_template(prompt_type: str, additional_context: str) -> ChatPromptTemplate:
+        """
+        Build a prompt template, cached per (prompt_type, additional_context).
+        
+        Templates are immutable, so the cached instance is shared between calls.
+        """
         system_prompt = SYSTEM_PROMPTS.get(prompt_type, SYSTEM_PROMPTS["default"])
+        return _make_prompt_template(f"{system_prompt}\n\nAdditional context:\n{additional_context}")
+    
+    def _get_chain(self, prompt_type: str = "default", additional_context: str = "") -> Runnable:
+        """
+        Get the composed `prompt | llm` chain for a prompt type and context.
         
-        if additional_context:
-            system_prompt = f"{system_prompt}\n\nAdditional context:\n{additional_context}"
+        Chains are built once and reused; the oldest entry is dropped once
+        CHAIN_CACHE_SIZE chains are cached.
         
-        return ChatPromptTemplate.from_messages([
-            SystemMessage(content=system_prompt),
-            MessagesPlaceholder(variable_name="chat_history"),
-            ("user", "{input}"),
-        ])
+        Args:
+            prompt_type: Type of prompt to use
+            additional_context: Additional context for the prompt
+            
+        Returns:
+            A runnable chain
+        """
+        key = (prompt_type, additional_context)
+        chain = self._chain_cache.get(key)
+        if chain is None:
+            if len(self._chain_cache) >= CHAIN_CACHE_SIZE:
+                self._chain_cache.pop(next(iter(self._chain_cache)))
+            chain = self.create_prompt_template(prompt_type, additional_context) | self.llm
+            self._chain_cache[key] = chain
+        return chain
     
     async def generate_code(
         self, 
@@ -174,11 +236,8 @@ class PromptEngineer:
         if chat_history is None:
             chat_history = []
         
-        # Create prompt template
-        prompt = self.create_prompt_template(prompt_type, additional_context)
-        
-        # Create chain
-        chain = prompt | self.llm
+        # Get the prompt | llm chain
+        chain = self._get_chain(prompt_type, additional_context)
         
         # Generate response
         response = await chain.ainvoke({
@@ -219,14 +278,40 @@ class PromptEngineer:
         Yields:
             Chunks of generated code
         """
+        async for content in self.stream_raw_code_generation(
+            user_input, prompt_type, additional_context, chat_history
+        ):
+            # Sanitize output
+            yield sanitize_output(content)
+    
+    async def stream_raw_code_generation(
+        self, 
+        user_input: str, 
+        prompt_type: str = "default", 
+        additional_context: str = "",
+        chat_history: List[Union[HumanMessage, AIMessage]] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        Stream code generation without HTML-escaping the chunks.
+        
+        For callers that store or render the code themselves, such as the
+        streaming generate endpoint, which saves the same raw code as
+        /api/generate.
+        
+        Args:
+            user_input: User's request
+            prompt_type: Type of prompt to use
+            additional_context: Additional context for the prompt
+            chat_history: Optional chat history
+            
+        Yields:
+            Unescaped chunks of generated code
+        """
         if chat_history is None:
             chat_history = []
         
-        # Create prompt template
-        prompt = self.create_prompt_template(prompt_type, additional_context)
-        
-        # Create chain
-        chain = prompt | self.llm
+        # Get the prompt | llm chain
+        chain = self._get_chain(prompt_type, additional_context)
         
         # Stream response
         async for chunk in chain.astream({
@@ -234,13 +319,10 @@ class PromptEngineer:
             "chat_history": chat_history
         }):
             if hasattr(chunk, "content"):
-                # Sanitize output
-                content = sanitize_output(chunk.content)
-                yield content
+                yield chunk.content
             else:
                 # Handle different response formats
-                content = sanitize_output(str(chunk))
-                yield content
+                yield str(chunk)
     
     async def evaluate_prompt(
         self, 
@@ -269,11 +351,8 @@ class PromptEngineer:
         if criteria is None:
             criteria = list(EVALUATION_CRITERIA.keys())
         
-        # Create prompt template
-        prompt = self.create_prompt_template(prompt_type)
-        
-        # Create chain
-        chain = prompt | self.llm
+        # Get the prompt | llm chain
+        chain = self._get_chain(prompt_type)
         
         # Create evaluators
         evaluators = []
@@ -293,6 +372,7 @@ class PromptEngineer:
         )
         
         results = await arun_on_dataset(
+            client=self._ls_client,
             dataset_name=dataset_name,
             llm_or_chain_factory=lambda: chain,
             evaluation=eval_config,
@@ -325,9 +405,7 @@ class PromptEngineer:
         if dataset_name is None:
             dataset_name = config.evaluation_dataset
         
-        from langsmith import Client
-        
-        client = Client(api_key=config.langsmith_api_key)
+        client = self._ls_client
         
         # Check if dataset exists
         try:
@@ -341,12 +419,13 @@ class PromptEngineer:
                     description="Evaluation dataset for Launch AI Generator"
                 )
             
-            # Add examples
-            for example in examples:
-                client.create_example(
-                    inputs={"input": example["input"]},
-                    outputs={"expected_output": example.get("expected_output", "")},
-                    dataset_id=dataset_name
+            # Add examples in batches, one request per batch
+            for start in range(0, len(examples), EXAMPLE_BATCH_SIZE):
+                batch = examples[start:start + EXAMPLE_BATCH_SIZE]
+                client.create_examples(
+                    inputs=[{"input": example["input"]} for example in batch],
+                    outputs=[{"expected_output": example.get("expected_output", "")} for example in batch],
+                    dataset_name=dataset_name
                 )
             
             return dataset_name
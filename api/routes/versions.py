@@ -3,12 +3,16 @@ Version control system for UI components and code blocks.
 """
 
 import os
-import json
+import atexit
 import logging
+import tempfile
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from pathlib import Path
 
+import orjson
 from flask import jsonify, request
 from flask_limiter.util import get_remote_address
 
@@ -21,6 +25,82 @@ logger = logging.getLogger(__name__)
 VERSIONS_DIR = Path("/tmp/launch/versions")
 VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Pretty-print version files only in debug mode; compact output otherwise
+DUMP_OPTIONS = orjson.OPT_INDENT_2 if config.debug else 0
+
+# Parsed version lists keyed by file path, with the mtime they were read at,
+# least recently used first. Only clean (flushed) entries are evicted.
+_VERSIONS_MEM: "OrderedDict[Path, Tuple[int, List[Dict]]]" = OrderedDict()
+VERSIONS_MEM_SIZE = 64
+
+# Write-behind state: files whose in-memory list has not been written yet
+FLUSH_DELAY = 1.0  # seconds
+_DIRTY: Set[Path] = set()
+_LOCK = threading.RLock()
+_flush_timer: Optional[threading.Timer] = None
+
+def _remember_versions(version_file: Path, mtime: int, versions: List[Dict]) -> None:
+    """Cache a version list and evict the least recently used clean lists. Caller holds _LOCK."""
+    _VERSIONS_MEM[version_file] = (mtime, versions)
+    _VERSIONS_MEM.move_to_end(version_file)
+    if len(_VERSIONS_MEM) > VERSIONS_MEM_SIZE:
+        for path in list(_VERSIONS_MEM):
+            if len(_VERSIONS_MEM) <= VERSIONS_MEM_SIZE:
+                break
+            if path not in _DIRTY and path != version_file:
+                del _VERSIONS_MEM[path]
+
+def _write_versions(version_file: Path, versions: List[Dict]) -> None:
+    """
+    Write a version list to disk and record its new mtime. Caller holds _LOCK.
+    
+    The list is serialized before any file is touched and written to a
+    temporary file that replaces the target, so a serialization error or a
+    failed write leaves the existing file intact.
+    """
+    data = orjson.dumps(versions, option=DUMP_OPTIONS)
+    fd, tmp_path = tempfile.mkstemp(dir=version_file.parent, prefix=f".{version_file.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, version_file)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _remember_versions(version_file, version_file.stat().st_mtime_ns, versions)
+
+def flush_versions() -> None:
+    """Write every pending version list to disk."""
+    global _flush_timer
+    with _LOCK:
+        _flush_timer = None
+        for version_file in list(_DIRTY):
+            try:
+                _write_versions(version_file, _VERSIONS_MEM[version_file][1])
+                _DIRTY.discard(version_file)
+            except orjson.JSONEncodeError as e:
+                # Retrying cannot help; drop the pending list so the file on
+                # disk is served again
+                logger.error(f"Dropping unserializable versions for {version_file}: {str(e)}")
+                _DIRTY.discard(version_file)
+                _VERSIONS_MEM.pop(version_file, None)
+            except Exception as e:
+                logger.error(f"Error flushing versions to {version_file}: {str(e)}")
+
+def _schedule_flush() -> None:
+    """Start the debounce timer if one is not already pending. Caller holds _LOCK."""
+    global _flush_timer
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(FLUSH_DELAY, flush_versions)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+# Don't lose saves still waiting for the timer when the process exits
+atexit.register(flush_versions)
+
 class VersionManager:
     @staticmethod
     def get_version_file(component_name: str) -> Path:
@@ -33,10 +113,26 @@ class VersionManager:
         """Load all versions for a component."""
         try:
             version_file = VersionManager.get_version_file(component_name)
-            if version_file.exists():
-                with open(version_file, "r") as f:
-                    return json.load(f)
-            return []
+            with _LOCK:
+                # Unflushed saves are newer than the file on disk
+                if version_file in _DIRTY:
+                    return _VERSIONS_MEM[version_file][1]
+                
+                try:
+                    mtime = version_file.stat().st_mtime_ns
+                except FileNotFoundError:
+                    return []
+                
+                # Reuse the parsed list unless the file changed since it was read
+                cached = _VERSIONS_MEM.get(version_file)
+                if cached is not None and cached[0] == mtime:
+                    _VERSIONS_MEM.move_to_end(version_file)
+                    return cached[1]
+                
+                with open(version_file, "rb") as f:
+                    versions = orjson.loads(f.read())
+                _remember_versions(version_file, mtime, versions)
+                return versions
         except Exception as e:
             logger.error(f"Error loading versions for {component_name}: {str(e)}")
             return []
@@ -47,26 +143,47 @@ class VersionManager:
         code: str,
         metadata: Optional[Dict] = None
     ) -> bool:
-        """Save a new version of a component."""
+        """
+        Save a new version of a component.
+        
+        The version is kept in memory and written to disk after FLUSH_DELAY
+        seconds, so a burst of saves costs a single write. Pass
+        ``metadata={"sync": True}`` to write immediately; the flag itself is
+        not stored.
+        """
         try:
-            versions = VersionManager.load_versions(component_name)
-            
-            new_version = {
-                "id": f"{len(versions) + 1}_{datetime.now().timestamp()}",
-                "timestamp": datetime.now().isoformat(),
-                "code": code,
-                "metadata": metadata or {}
-            }
-            
-            versions.insert(0, new_version)
-            
-            # Keep only the last 50 versions
-            if len(versions) > 50:
-                versions = versions[:50]
-            
+            metadata = metadata or {}
+            sync = False
+            if isinstance(metadata, dict) and "sync" in metadata:
+                metadata = dict(metadata)
+                sync = bool(metadata.pop("sync"))
             version_file = VersionManager.get_version_file(component_name)
-            with open(version_file, "w") as f:
-                json.dump(versions, f, indent=2)
+            
+            with _LOCK:
+                versions = VersionManager.load_versions(component_name)
+                
+                new_version = {
+                    "id": f"{len(versions) + 1}_{datetime.now().timestamp()}",
+                    "timestamp": datetime.now().isoformat(),
+                    "code": code,
+                    "metadata": metadata
+                }
+                
+                # Reject input orjson cannot write (e.g. integers above 64
+                # bits) now, rather than in the deferred flush
+                orjson.dumps(new_version)
+                
+                # Build a new list (keeping only the last 50 versions) so the
+                # cached one is left untouched if a synchronous write fails
+                versions = [new_version] + versions[:49]
+                
+                if sync:
+                    _write_versions(version_file, versions)
+                    _DIRTY.discard(version_file)
+                else:
+                    _DIRTY.add(version_file)
+                    _remember_versions(version_file, -1, versions)
+                    _schedule_flush()
             
             return True
         except Exception as e:
@@ -0,0 +1,129 @@
+# @author likhonsheikh
+"""
+Input and output sanitizers for Launch AI Generator.
+
+This module is shared by the Flask and agent security modules and depends
+only on the standard library, using google-re2 when it is installed.
+"""
+
+import logging
+import re
+from functools import lru_cache
+
+# google-re2 is optional; when installed the sanitizer patterns use its
+# linear-time matcher instead of the backtracking stdlib engine
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+def _compile(pattern: str):
+    """
+    Compile a sanitizer pattern with re2 if available, else with re.
+    
+    The patterns only involve ASCII characters, so re.ASCII skips Unicode
+    class and case folding on the stdlib engine.
+    """
+    if re2 is not None:
+        return re2.compile(pattern)
+    return re.compile(pattern, re.ASCII)
+
+# Sanitizer patterns, compiled once at import
+_SQL_RE = _compile(r'(?i)\b(SELECT|INSERT|UPDATE|DELETE|DROP|ALTER|UNION|CREATE|WHERE)\b')
+
+# Tags are stripped in their own pass first, so a keyword or `$(` split
+# by a tag (e.g. `$<>(`) is rejoined before the scrub below sees it
+_TAG_RE = _compile(r'<[^>]*>')
+
+# SQL keywords and shell metacharacters in one alternation, so the scrub
+# is a single scan: group 1 is lowercased and group 2 replaced with a space
+_SANITIZE_RE = _compile(
+    r'(?i)(\b(?:SELECT|INSERT|UPDATE|DELETE|DROP|ALTER|UNION|CREATE|WHERE)\b)'
+    r'|([;|`]|\$\()'
+)
+
+# Characters that mean sanitize_input has work to do
+_UNSAFE_CHARS = '<;|`$'
+
+# Maximum length of sanitized input
+MAX_INPUT_LENGTH = 4000
+
+def _sanitize_match(match) -> str:
+    """
+    Replacement for one _SANITIZE_RE match.
+    """
+    keyword = match.group(1)
+    if keyword is not None:
+        return keyword.lower()
+    return ' '
+
+def sanitize_input(text: str) -> str:
+    """
+    Sanitize user input to prevent injection attacks.
+    
+    Args:
+        text: Input text to sanitize
+        
+    Returns:
+        Sanitized text
+    """
+    if not text:
+        return ""
+    
+    # Limit length first so the passes below scan a bounded string
+    if len(text) > MAX_INPUT_LENGTH:
+        text = text[:MAX_INPUT_LENGTH]
+        logger.warning(f"Input text truncated to {MAX_INPUT_LENGTH} characters")
+    
+    # Fast path: text with nothing to scrub is returned as-is
+    if not any(c in text for c in _UNSAFE_CHARS) and not _SQL_RE.search(text):
+        return text
+    
+    # Remove HTML/XML tags
+    if '<' in text:
+        text = _TAG_RE.sub('', text)
+    
+    # Remove SQL injection and command injection patterns
+    return _SANITIZE_RE.sub(_sanitize_match, text)
+
+# Same entities as html.escape(quote=True), applied in one translate() pass
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+# Outputs shorter than this are escaped through _escape_cached
+_ESCAPE_CACHE_MAX_LEN = 256
+
+@lru_cache(maxsize=1024)
+def _escape_cached(text: str) -> str:
+    """
+    Escape a short output string, memoized for repeated status messages.
+    """
+    return text.translate(_HTML_ESCAPE_TABLE)
+
+def sanitize_output(text: str) -> str:
+    """
+    Sanitize output to prevent XSS and other attacks.
+    
+    Args:
+        text: Output text to sanitize
+        
+    Returns:
+        Sanitized text
+    """
+    if not text:
+        return ""
+    
+    # Escape HTML entities
+    if len(text) < _ESCAPE_CACHE_MAX_LEN:
+        text = _escape_cached(text)
+    else:
+        text = text.translate(_HTML_ESCAPE_TABLE)
+    
+    return text
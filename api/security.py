@@ -7,108 +7,131 @@ output sanitization, and API key validation.
 """
 
 import logging
-import re
-import html
-from typing import Dict, Any, Optional
-from flask import Request
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Dict, Any, FrozenSet, Mapping, Optional, Tuple
+from flask import abort, request
 
 from .config import config
+from .sanitizer import MAX_INPUT_LENGTH, sanitize_input, sanitize_output
 
 logger = logging.getLogger(__name__)
 
-def sanitize_input(text: str) -> str:
-    """
-    Sanitize user input to prevent injection attacks.
-    
-    Args:
-        text: Input text to sanitize
-        
-    Returns:
-        Sanitized text
-    """
-    if not text:
-        return ""
-    
-    # Remove potentially dangerous patterns
-    # Remove HTML/XML tags
-    text = re.sub(r'<[^>]*>', '', text)
-    
-    # Remove potential SQL injection patterns
-    text = re.sub(r'(\b(SELECT|INSERT|UPDATE|DELETE|DROP|ALTER|UNION|CREATE|WHERE)\b)', 
-                 lambda match: match.group(1).lower(), text, flags=re.IGNORECASE)
-    
-    # Remove potential command injection patterns
-    text = re.sub(r'(;|\||\$\(|\`)', ' ', text)
-    
-    # Limit length
-    max_length = 4000
-    if len(text) > max_length:
-        text = text[:max_length]
-        logger.warning(f"Input text truncated to {max_length} characters")
-    
-    return text
+# Token buckets per client address: (tokens left, time of last refill),
+# least recently used first. _BUCKETS_LOCK makes each take atomic under
+# threaded servers.
+_BUCKETS: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+_BUCKETS_LOCK = threading.Lock()
 
-def sanitize_output(text: str) -> str:
-    """
-    Sanitize output to prevent XSS and other attacks.
-    
-    Args:
-        text: Output text to sanitize
-        
-    Returns:
-        Sanitized text
-    """
-    if not text:
-        return ""
-    
-    # Escape HTML entities
-    text = html.escape(text)
-    
-    return text
+# Config values read on every request, bound once at import. Changing them
+# takes a config reload and a re-import of this module (a new deployment).
+_DEBUG = bool(config.debug)
+_API_KEYS: FrozenSet[str] = frozenset(config.api_keys or ())
+_RATE_LIMIT_REQUESTS = config.rate_limit_requests
+_RATE_LIMIT_WINDOW = config.rate_limit_window
+
+# Accepted request origins
+_ALLOWED_ORIGINS: FrozenSet[str] = frozenset({
+    "https://launch-ai-generator.vercel.app",
+    "https://launch-ai.vercel.app",
+    # Add more as needed
+})
 
-def validate_api_key(request: Request) -> bool:
+def validate_api_key(headers: Mapping[str, str]) -> bool:
     """
     Validate API key from request headers.
     
     Args:
-        request: Flask request object
+        headers: Request headers, e.g. request.headers
         
     Returns:
         True if valid, False otherwise
     """
-    if not config.api_keys:
+    if not _API_KEYS:
         return True
     
-    api_key = request.headers.get("X-API-Key")
+    api_key = headers.get("X-API-Key")
     if not api_key:
         return False
     
-    return api_key in config.api_keys
+    return api_key in _API_KEYS
 
-def validate_request_origin(request: Request) -> bool:
+def validate_request_origin(headers: Mapping[str, str]) -> bool:
     """
     Validate request origin to prevent CSRF attacks.
     
     Args:
-        request: Flask request object
+        headers: Request headers, e.g. request.headers
         
     Returns:
         True if valid, False otherwise
     """
     # Allow all origins in development
-    if config.debug:
+    if _DEBUG:
         return True
     
     # Check origin header
-    origin = request.headers.get("Origin")
+    origin = headers.get("Origin")
     if not origin:
         return True  # No origin header, could be a direct API call
     
-    # List of allowed origins
-    allowed_origins = [
-        "https://launch-ai-generator.vercel.app",
-        "https://launch-ai.vercel.app",
-        # Add more as needed
-    ]
+    # Same-origin requests are allowed without consulting the allow list
+    host = headers.get("Host")
+    if host and origin == "https://" + host:
+        return True
+    
+    return origin in _ALLOWED_ORIGINS
+
+def _take_token(client_id: str) -> bool:
+    """
+    Take one token from a client's bucket.
+    
+    Buckets hold up to config.rate_limit_requests tokens and refill at
+    rate_limit_requests per rate_limit_window seconds. A bucket untouched for
+    a whole window is full again, the same as a new one, so idle buckets at
+    the least recently used end are dropped as requests come in.
     
-    return origin in allowed_origins
+    Args:
+        client_id: Identifier for the client
+        
+    Returns:
+        True if the request is allowed, False if the bucket is empty
+    """
+    rate = _RATE_LIMIT_REQUESTS
+    with _BUCKETS_LOCK:
+        now = time.monotonic()
+        tokens, last = _BUCKETS.pop(client_id, (rate, now))
+        tokens = min(rate, tokens + (now - last) * rate / _RATE_LIMIT_WINDOW)
+        
+        # Drop buckets that have refilled completely
+        while _BUCKETS:
+            oldest = next(iter(_BUCKETS.values()))
+            if now - oldest[1] < _RATE_LIMIT_WINDOW:
+                break
+            _BUCKETS.popitem(last=False)
+        
+        if tokens < 1:
+            _BUCKETS[client_id] = (tokens, now)
+            return False
+        _BUCKETS[client_id] = (tokens - 1, now)
+        return True
+
+def check_rate_limit(f):
+    """
+    Rate limit a Flask view per client address.
+    
+    Args:
+        f: View function to wrap
+        
+    Returns:
+        The wrapped view, which aborts with 429 once the client's bucket is empty
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not _take_token(request.remote_addr or "unknown"):
+            logger.warning("Rate limit exceeded for client %s", request.remote_addr)
+            abort(429, description="Rate limit exceeded")
+        return f(*args, **kwargs)
+    return decorated_function
@@ -1,10 +1,21 @@
-/**
- * @author likhonsheikh
- * @license AGPL-3.0
- * @link https://github.com/likhonsheikhofficial
- */
+# @author likhonsheikh
+"""
+Local development server for the Launch AI Generator FastAPI app.
+
+Runs uvicorn with the uvloop event loop and the httptools HTTP parser.
+uvloop does not support Windows, so the stock asyncio loop is used there.
+Works both as `python api/server.py` and `python -m api.server`.
+"""
+
+import sys
+from pathlib import Path
 
 import uvicorn
 
+LOOP = "asyncio" if sys.platform == "win32" else "uvloop"
+
+# Repository root, so the `api` package imports when run as a script
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+
 if __name__ == "__main__":
-    uvicorn.run("index:app", host="0.0.0.0", port=8000)
+    uvicorn.run("api.index:app", host="0.0.0.0", port=8000, loop=LOOP, http="httptools", app_dir=APP_DIR)
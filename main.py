@@ -3,9 +3,7 @@
 Main entry point for the Launch AI Generator application.
 """
 
-import os
 import logging
-from api.app import app
 from api.config import config
 
 # Configure logging
@@ -16,11 +14,29 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Log configuration immediately (on cold start)
-logger.info(f"Starting Launch AI Generator with provider: {config.provider}")
-logger.info(f"Model: {config.model_name}")
-logger.info(f"LangSmith tracing enabled: {config.tracing_enabled}")
-logger.info(f"Rate limiting: {config.rate_limit_requests} requests per {config.rate_limit_window} seconds")
+logger.info("Starting Launch AI Generator with provider: %s", config.provider)
+logger.info("Model: %s", config.model_name)
+logger.info("LangSmith tracing enabled: %s", config.tracing_enabled)
+logger.info("Rate limiting: %s requests per %s seconds", config.rate_limit_requests, config.rate_limit_window)
 
-# --- DO NOT call app.run() ---
-# Simply expose the `app` object
-# Vercel will automatically find and serve it
+# --- DO NOT call app.run() at import time ---
+# Expose `app` lazily (PEP 562): the Flask app and its routes are imported
+# on first access, so importing this module for its configuration stays cheap.
+# Vercel finds `app` through dir() and serves it.
+
+def __getattr__(name):
+    """Import the Flask app on first access to `main.app`."""
+    if name == "app":
+        from api.app import app
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    """List `app` alongside the module globals so it can be discovered."""
+    return sorted(set(globals()) | {"app"})
+
+if __name__ == "__main__":
+    # Local development server
+    from api.app import app
+    app.run(host=config.host, port=config.port, debug=config.debug)
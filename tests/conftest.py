@@ -0,0 +1,55 @@
+# @author likhonsheikh
+"""
+Shared fixtures for the test suite.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+
+@pytest.fixture(scope="module")
+def mock_memory_backends():
+    """Patch the embedding model and vector store used by MemoryManager."""
+    mock_embeddings_instance = MagicMock()
+    mock_embeddings_instance.client.get_sentence_embedding_dimension.return_value = 384
+    mock_embeddings = MagicMock(return_value=mock_embeddings_instance)
+    mock_faiss = MagicMock()
+    
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("api.agent.memory_manager.HuggingFaceEmbeddings", mock_embeddings)
+        mp.setattr("api.agent.memory_manager.FAISS", mock_faiss)
+        yield mock_embeddings, mock_faiss
+
+@pytest.fixture(scope="module")
+def mock_http_client():
+    """Patch the httpx client used by ToolRegistry with a canned completion."""
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.json.return_value = {"choices": [{"text": "def test(): pass"}]}
+    
+    mock_client_instance = MagicMock()
+    mock_client_instance.__aenter__.return_value = mock_client_instance
+    mock_client_instance.post.return_value = mock_response
+    mock_client = MagicMock(return_value=mock_client_instance)
+    
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("api.agent.tool_registry.httpx.AsyncClient", mock_client)
+        yield mock_client
+
+@pytest.fixture(scope="module")
+def mock_agent_dependencies():
+    """Patch the LLM, memory manager and tool registry used by AgentManager."""
+    mock_together = MagicMock(return_value=MagicMock())
+    
+    mock_memory_manager_instance = MagicMock()
+    mock_memory_manager_instance.get_memory.return_value = MagicMock()
+    mock_memory_manager = MagicMock(return_value=mock_memory_manager_instance)
+    
+    mock_tool_registry_instance = MagicMock()
+    mock_tool_registry_instance.get_tools.return_value = [MagicMock()]
+    mock_tool_registry = MagicMock(return_value=mock_tool_registry_instance)
+    
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("api.agent.agent_manager.Together", mock_together)
+        mp.setattr("api.agent.agent_manager.MemoryManager", mock_memory_manager)
+        mp.setattr("api.agent.agent_manager.ToolRegistry", mock_tool_registry)
+        yield mock_together, mock_memory_manager, mock_tool_registry
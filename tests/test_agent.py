@@ -5,13 +5,14 @@ Tests for the agent functionality.
 
 import os
 import pytest
-from unittest.mock import patch, MagicMock
+from collections import OrderedDict
 
 from api.agent.config import AgentConfig
 from api.agent.agent_manager import AgentManager
 from api.agent.memory_manager import MemoryManager
 from api.agent.tool_registry import ToolRegistry
 from api.agent.security import sanitize_input, sanitize_output, check_rate_limit
+import api.agent.security as agent_security
 
 # Skip tests if environment variables are not set
 pytestmark = pytest.mark.skipif(
@@ -29,6 +30,11 @@ def test_sanitize_input():
     
     # Test command injection pattern handling
     assert ";" not in sanitize_input("ls; rm -rf /")
+    assert sanitize_input("$(rm -rf /)") == " rm -rf /)"
+    
+    # Patterns split by a tag are caught once the tag is removed
+    assert sanitize_input("$<>(rm -rf /)") == " rm -rf /)"
+    assert sanitize_input("SEL<b>ECT * FROM users") == "select * FROM users"
 
 def test_sanitize_output():
     """Test output sanitization."""
@@ -47,15 +53,20 @@ def test_rate_limit():
     
     assert not check_rate_limit("test_client_2", limit=5, window=60)
 
-@patch("api.agent.memory_manager.FAISS")
-@patch("api.agent.memory_manager.HuggingFaceEmbeddings")
-def test_memory_manager(mock_embeddings, mock_faiss):
-    """Test memory manager."""
-    # Mock embeddings
-    mock_embeddings_instance = MagicMock()
-    mock_embeddings_instance.client.get_sentence_embedding_dimension.return_value = 384
-    mock_embeddings.return_value = mock_embeddings_instance
+def test_rate_limit_evicts_least_recent_client(monkeypatch):
+    """Test that the client table is capped without scanning it."""
+    monkeypatch.setattr(agent_security, "rate_limits", OrderedDict())
+    monkeypatch.setattr(agent_security, "RATE_LIMIT_MAX_CLIENTS", 2)
+    
+    check_rate_limit("client_a", limit=5, window=60)
+    check_rate_limit("client_b", limit=5, window=60)
+    check_rate_limit("client_a", limit=5, window=60)
+    check_rate_limit("client_c", limit=5, window=60)
     
+    assert list(agent_security.rate_limits) == ["client_a", "client_c"]
+
+def test_memory_manager(mock_memory_backends):
+    """Test memory manager."""
     # Create config
     config = AgentConfig()
     config.memory_dir = "/tmp/test_memory"
@@ -73,20 +84,8 @@ def test_memory_manager(mock_embeddings, mock_faiss):
     # Test non-existent memory
     assert not memory_manager.clear_memory("non_existent_session")
 
-@patch("api.agent.tool_registry.httpx.AsyncClient")
-def test_tool_registry(mock_client):
+def test_tool_registry(mock_http_client):
     """Test tool registry."""
-    # Mock response
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = {"choices": [{"text": "def test(): pass"}]}
-    
-    # Mock client
-    mock_client_instance = MagicMock()
-    mock_client_instance.__aenter__.return_value = mock_client_instance
-    mock_client_instance.post.return_value = mock_response
-    mock_client.return_value = mock_client_instance
-    
     # Create config
     config = AgentConfig()
     config.together_api_key = "test_key"
@@ -102,28 +101,8 @@ def test_tool_registry(mock_client):
     assert tool_registry.get_tool("generate_code") is not None
     assert tool_registry.get_tool("non_existent_tool") is None
 
-@patch("api.agent.agent_manager.Together")
-@patch("api.agent.agent_manager.ToolRegistry")
-@patch("api.agent.agent_manager.MemoryManager")
-def test_agent_manager(mock_memory_manager, mock_tool_registry, mock_together):
+def test_agent_manager(mock_agent_dependencies):
     """Test agent manager."""
-    # Mock LLM
-    mock_llm = MagicMock()
-    mock_together.return_value = mock_llm
-    
-    # Mock memory manager
-    mock_memory = MagicMock()
-    mock_memory_manager_instance = MagicMock()
-    mock_memory_manager_instance.get_memory.return_value = mock_memory
-    mock_memory_manager.return_value = mock_memory_manager_instance
-    
-    # Mock tool registry
-    mock_tools = [MagicMock()]
-    
-    mock_tool_registry_instance = MagicMock()
-    mock_tool_registry_instance.get_tools.return_value = mock_tools
-    mock_tool_registry.return_value = mock_tool_registry_instance
-    
     # Create config
     config = AgentConfig()
     config.together_api_key = "test_key"
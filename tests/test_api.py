@@ -4,31 +4,39 @@ Tests for the API endpoints.
 """
 
 import os
+import orjson
 import pytest
 from fastapi.testclient import TestClient
 
+import api.index
 from api.index import app
 
-client = TestClient(app)
+@pytest.fixture(scope="session")
+def client():
+    """Shared test client, started once per test session."""
+    with TestClient(app) as c:
+        yield c
 
-def test_health_endpoint():
+def test_health_endpoint(client):
     """Test the health endpoint."""
     response = client.get("/health")
     assert response.status_code == 200
     assert "status" in response.json()
     assert response.json()["status"] == "ok"
 
-def test_debug_endpoint():
+def test_debug_endpoint(client, monkeypatch):
     """Test the debug endpoint."""
-    # Set non-production environment
-    os.environ["VERCEL_ENV"] = "development"
+    # Set non-production environment (read once at import as api.index._IS_PROD)
+    monkeypatch.setenv("VERCEL_ENV", "development")
+    monkeypatch.setattr(api.index, "_IS_PROD", False)
     
     response = client.get("/debug")
     assert response.status_code == 200
     assert "python_version" in response.json()
     
     # Test production environment
-    os.environ["VERCEL_ENV"] = "production"
+    monkeypatch.setenv("VERCEL_ENV", "production")
+    monkeypatch.setattr(api.index, "_IS_PROD", True)
     response = client.get("/debug")
     assert response.status_code == 200
     assert "message" in response.json()
@@ -38,7 +46,7 @@ def test_debug_endpoint():
     not os.environ.get("TOGETHER_API_KEY"),
     reason="TOGETHER_API_KEY environment variable not set"
 )
-def test_generate_endpoint():
+def test_generate_endpoint(client):
     """Test the generate endpoint."""
     response = client.post(
         "/api/generate",
@@ -58,7 +66,34 @@ def test_generate_endpoint():
         # Skip if API call fails
         pytest.skip(f"API call failed with status {response.status_code}: {response.text}")
 
-def test_versions_endpoint():
+class FakePromptEngineer:
+    """Prompt engineer stand-in that streams fixed raw chunks."""
+    provider = "groq"
+    
+    async def stream_raw_code_generation(self, prompt, prompt_type="default", additional_context="", chat_history=None):
+        for chunk in ("<div>", "Hello", "</div>"):
+            yield chunk
+
+def test_generate_stream_endpoint(client, monkeypatch, tmp_path):
+    """Test that streamed code is sent and saved unescaped."""
+    monkeypatch.setattr(api.index, "_prompt_engineer", FakePromptEngineer())
+    monkeypatch.setattr(api.index, "VERSIONS_DIR", tmp_path)
+    
+    response = client.post("/api/generate/stream", data={"prompt": "Test prompt"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    
+    events = [orjson.loads(line[len("data: "):])
+              for line in response.text.split("\n\n") if line.startswith("data: ")]
+    timestamp = events[0]["timestamp"]
+    assert [event["chunk"] for event in events if "chunk" in event] == ["<div>", "Hello", "</div>"]
+    assert events[-1] == {"done": True}
+    
+    # The saved version holds raw code and the provider that generated it
+    assert (tmp_path / f"{timestamp}.html").read_text() == "<div>Hello</div>"
+    assert orjson.loads((tmp_path / f"{timestamp}.json").read_bytes())["model"] == "groq"
+
+def test_versions_endpoint(client):
     """Test the versions endpoint."""
     response = client.get("/api/versions")
     assert response.status_code == 200
@@ -69,7 +104,7 @@ def test_versions_endpoint():
     not os.environ.get("TOGETHER_API_KEY"),
     reason="TOGETHER_API_KEY environment variable not set"
 )
-def test_agent_chat_endpoint():
+def test_agent_chat_endpoint(client):
     """Test the agent chat endpoint."""
     response = client.post(
         "/api/agent/chat",
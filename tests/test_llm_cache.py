@@ -0,0 +1,66 @@
+# @author likhonsheikh
+"""
+Tests for the LLM response cache.
+"""
+
+import asyncio
+
+import api.llm_cache as llm_cache
+from api.llm_cache import InMemoryCache, create_cache, make_cache_key
+
+def test_make_cache_key_is_stable():
+    """Test that equal requests share a key and differing ones do not."""
+    key = make_cache_key("model", "landing", "prompt", 0.0, 2000)
+    assert key == make_cache_key("model", "landing", "prompt", 0.0, 2000)
+    assert len(key) == 64
+
+    assert key != make_cache_key("other", "landing", "prompt", 0.0, 2000)
+    assert key != make_cache_key("model", None, "prompt", 0.0, 2000)
+    assert key != make_cache_key("model", "landing", "prompt!", 0.0, 2000)
+    assert key != make_cache_key("model", "landing", "prompt", 0.7, 2000)
+    assert key != make_cache_key("model", "landing", "prompt", 0.0, 1000)
+
+def test_in_memory_cache_get_and_set():
+    """Test storing and reading a response."""
+    async def run():
+        cache = InMemoryCache()
+        assert await cache.get("key") is None
+        await cache.set("key", "value", ttl=60)
+        assert await cache.get("key") == "value"
+
+    asyncio.run(run())
+
+def test_in_memory_cache_expires_entries(monkeypatch):
+    """Test that entries are dropped once their TTL has passed."""
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "monotonic", lambda: now[0])
+
+    async def run():
+        cache = InMemoryCache()
+        await cache.set("key", "value", ttl=10)
+        now[0] += 9
+        assert await cache.get("key") == "value"
+        now[0] += 2
+        assert await cache.get("key") is None
+        assert "key" not in cache._entries
+
+    asyncio.run(run())
+
+def test_in_memory_cache_evicts_least_recently_used():
+    """Test that the least recently read entry is evicted first."""
+    async def run():
+        cache = InMemoryCache(max_entries=2)
+        await cache.set("a", "1", ttl=60)
+        await cache.set("b", "2", ttl=60)
+        assert await cache.get("a") == "1"
+        await cache.set("c", "3", ttl=60)
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == "1"
+        assert await cache.get("c") == "3"
+
+    asyncio.run(run())
+
+def test_create_cache_defaults_to_memory():
+    """Test that no Redis URL gives the in-memory backend."""
+    assert isinstance(create_cache(""), InMemoryCache)
@@ -0,0 +1,60 @@
+# @author likhonsheikh
+"""
+Tests for the shared input and output sanitizers.
+"""
+
+import html
+import importlib
+import re
+import sys
+
+import pytest
+
+import api.sanitizer as sanitizer
+from api.sanitizer import MAX_INPUT_LENGTH, sanitize_input, sanitize_output
+
+def test_sanitize_input():
+    """Test tag, SQL and command scrubbing."""
+    assert sanitize_input("") == ""
+    assert sanitize_input("hello world") == "hello world"
+    assert sanitize_input("<script>alert('XSS')</script>") == "alert('XSS')"
+    assert sanitize_input("SELECT * FROM users") == "select * FROM users"
+    assert sanitize_input("ls; rm -rf / | cat `id`") == "ls  rm -rf /   cat  id "
+    assert sanitize_input("$(rm -rf /)") == " rm -rf /)"
+
+def test_sanitize_input_tag_split_patterns():
+    """Test that patterns split by a tag are caught once the tag is removed."""
+    assert sanitize_input("$<>(rm -rf /)") == " rm -rf /)"
+    assert sanitize_input("SEL<b>ECT * FROM users") == "select * FROM users"
+
+def test_sanitize_input_truncates():
+    """Test that long input is cut to MAX_INPUT_LENGTH."""
+    assert len(sanitize_input("a" * (MAX_INPUT_LENGTH + 10))) == MAX_INPUT_LENGTH
+
+def test_sanitize_output_matches_html_escape():
+    """Test that output escaping matches html.escape on short and long text."""
+    for text in ["<a href=\"x\">it's & ok</a>", "x" * 300 + "<&>'\""]:
+        assert sanitize_output(text) == html.escape(text)
+    assert sanitize_output("") == ""
+
+def test_sanitizer_falls_back_to_re_without_re2(monkeypatch):
+    """Test that the stdlib engine is used when re2 is not installed."""
+    # A None entry in sys.modules makes `import re2` raise ImportError
+    monkeypatch.setitem(sys.modules, "re2", None)
+    try:
+        module = importlib.reload(sanitizer)
+        assert module.re2 is None
+        assert isinstance(module._SANITIZE_RE, re.Pattern)
+        assert module._SANITIZE_RE.flags & re.ASCII
+        assert module.sanitize_input("$<>(ls)") == " ls)"
+    finally:
+        monkeypatch.undo()
+        importlib.reload(sanitizer)
+
+def test_sanitizer_uses_re2_when_installed():
+    """Test that re2 compiles the patterns when it is installed."""
+    pytest.importorskip("re2")
+    module = importlib.reload(sanitizer)
+    assert module.re2 is not None
+    assert not isinstance(module._SANITIZE_RE, re.Pattern)
+    assert module.sanitize_input("$<>(ls)") == " ls)"
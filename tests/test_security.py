@@ -0,0 +1,60 @@
+# @author likhonsheikh
+"""
+Tests for the Flask security helpers.
+"""
+
+import pytest
+from flask import Flask
+
+import api.security as security
+
+@pytest.fixture
+def limited_app(monkeypatch):
+    """Flask app with one rate-limited view allowing two requests per window."""
+    monkeypatch.setattr(security, "_RATE_LIMIT_REQUESTS", 2)
+    monkeypatch.setattr(security, "_RATE_LIMIT_WINDOW", 60)
+    security._BUCKETS.clear()
+
+    app = Flask(__name__)
+
+    @app.route("/limited")
+    @security.check_rate_limit
+    def limited():
+        return "ok"
+
+    yield app
+    security._BUCKETS.clear()
+
+def test_check_rate_limit_returns_429(limited_app):
+    """Test that the decorator aborts with 429 once the bucket is empty."""
+    client = limited_app.test_client()
+    assert client.get("/limited").status_code == 200
+    assert client.get("/limited").status_code == 200
+
+    response = client.get("/limited")
+    assert response.status_code == 429
+    assert b"Rate limit exceeded" in response.data
+
+    # Other clients have their own bucket
+    other = client.get("/limited", environ_base={"REMOTE_ADDR": "10.0.0.2"})
+    assert other.status_code == 200
+
+def test_take_token_drops_idle_buckets(limited_app, monkeypatch):
+    """Test that buckets idle for a whole window are removed."""
+    now = [1000.0]
+    monkeypatch.setattr(security.time, "monotonic", lambda: now[0])
+
+    assert security._take_token("idle")
+    now[0] += 61
+    assert security._take_token("active")
+    assert list(security._BUCKETS) == ["active"]
+
+def test_validate_api_key(monkeypatch):
+    """Test API key validation against the configured keys."""
+    monkeypatch.setattr(security, "_API_KEYS", frozenset())
+    assert security.validate_api_key({})
+
+    monkeypatch.setattr(security, "_API_KEYS", frozenset({"secret"}))
+    assert security.validate_api_key({"X-API-Key": "secret"})
+    assert not security.validate_api_key({"X-API-Key": "wrong"})
+    assert not security.validate_api_key({})
@@ -0,0 +1,127 @@
+# @author likhonsheikh
+"""
+Tests for the component version store.
+"""
+
+import pytest
+
+import api.routes.versions as versions
+from api.routes.versions import VersionManager
+
+@pytest.fixture
+def version_store(tmp_path, monkeypatch):
+    """Point the version store at a temporary directory with empty caches."""
+    monkeypatch.setattr(versions, "VERSIONS_DIR", tmp_path)
+    monkeypatch.setattr(versions, "_VERSIONS_MEM", versions.OrderedDict())
+    monkeypatch.setattr(versions, "_DIRTY", set())
+    yield tmp_path
+    # Cancel any pending debounce timer and write out what it would have
+    if versions._flush_timer is not None:
+        versions._flush_timer.cancel()
+    versions.flush_versions()
+
+def test_versions_cache_is_bounded(version_store, monkeypatch):
+    """Test that only the most recently used clean lists stay in memory."""
+    monkeypatch.setattr(versions, "VERSIONS_MEM_SIZE", 2)
+    for name in ("a", "b", "c"):
+        assert VersionManager.save_version(name, "code", {"sync": True})
+
+    cached = [path.name for path in versions._VERSIONS_MEM]
+    assert cached == ["b_versions.json", "c_versions.json"]
+
+    # Evicted lists are read back from disk
+    assert VersionManager.load_versions("a")[0]["code"] == "code"
+
+def test_versions_cache_keeps_dirty_lists(version_store, monkeypatch):
+    """Test that unflushed lists are never evicted."""
+    monkeypatch.setattr(versions, "VERSIONS_MEM_SIZE", 1)
+    assert VersionManager.save_version("a", "code")
+    assert VersionManager.save_version("b", "code")
+
+    assert len(versions._VERSIONS_MEM) == 2
+    assert VersionManager.load_versions("a")[0]["code"] == "code"
+
+def test_save_version_accepts_non_dict_metadata(version_store):
+    """Test that list or string metadata is stored as given."""
+    assert VersionManager.save_version("a", "code", ["x"])
+    assert VersionManager.save_version("a", "code", "note")
+
+    saved = VersionManager.load_versions("a")
+    assert [version["metadata"] for version in saved] == ["note", ["x"]]
+
+def test_save_version_sync_writes_immediately(version_store):
+    """Test that sync saves hit disk at once and the flag is not stored."""
+    metadata = {"sync": True, "author": "test"}
+    assert VersionManager.save_version("a", "code", metadata)
+
+    assert (version_store / "a_versions.json").exists()
+    assert VersionManager.load_versions("a")[0]["metadata"] == {"author": "test"}
+    assert metadata == {"sync": True, "author": "test"}
+
+def test_save_version_debounces_writes(version_store, monkeypatch):
+    """Test that a burst of saves is written once by the flush timer."""
+    monkeypatch.setattr(versions, "FLUSH_DELAY", 0.5)
+    version_file = version_store / "a_versions.json"
+    assert VersionManager.save_version("a", "one")
+    timer = versions._flush_timer
+    assert VersionManager.save_version("a", "two")
+    assert versions._flush_timer is timer
+    assert not version_file.exists()
+
+    timer.join(timeout=5)
+    assert version_file.exists()
+    assert not versions._DIRTY
+    assert [version["code"] for version in VersionManager.load_versions("a")] == ["two", "one"]
+
+def test_flush_versions_writes_pending_saves(version_store, monkeypatch):
+    """Test the flush registered with atexit writes saves still pending."""
+    monkeypatch.setattr(versions, "FLUSH_DELAY", 60)
+    assert VersionManager.save_version("a", "code")
+    versions._flush_timer.cancel()
+
+    versions.flush_versions()
+    assert (version_store / "a_versions.json").exists()
+    assert not versions._DIRTY
+
+def test_failed_sync_write_keeps_existing_file(version_store):
+    """Test that a failed serialization leaves the saved history intact."""
+    version_file = version_store / "x_versions.json"
+    assert VersionManager.save_version("x", "first", {"sync": True})
+    saved = version_file.read_bytes()
+
+    assert not VersionManager.save_version("x", "second", {"sync": True, "n": 2**70})
+
+    assert version_file.read_bytes() == saved
+    assert [p.name for p in version_store.iterdir()] == ["x_versions.json"]
+    assert [version["code"] for version in VersionManager.load_versions("x")] == ["first"]
+
+def test_save_version_rejects_unserializable_metadata(version_store):
+    """Test that a deferred save of unserializable data fails up front."""
+    version_file = version_store / "x_versions.json"
+    assert VersionManager.save_version("x", "first", {"sync": True})
+    saved = version_file.read_bytes()
+
+    assert not VersionManager.save_version("x", "second", {"n": 2**70})
+
+    assert version_file.read_bytes() == saved
+    assert not versions._DIRTY
+    assert [version["code"] for version in VersionManager.load_versions("x")] == ["first"]
+    assert [p.name for p in version_store.iterdir()] == ["x_versions.json"]
+
+def test_flush_versions_drops_unserializable_lists(version_store, monkeypatch):
+    """Test that a pending list that cannot be written is dropped, not retried."""
+    monkeypatch.setattr(versions, "FLUSH_DELAY", 60)
+    version_file = version_store / "x_versions.json"
+    assert VersionManager.save_version("x", "first", {"sync": True})
+    saved = version_file.read_bytes()
+
+    # Simulate a pending list that slipped past validation
+    with versions._LOCK:
+        versions._DIRTY.add(version_file)
+        versions._remember_versions(version_file, -1, [{"n": 2**70}])
+
+    versions.flush_versions()
+    assert version_file.read_bytes() == saved
+    assert not versions._DIRTY
+    assert version_file not in versions._VERSIONS_MEM
+    assert VersionManager.load_versions("x")[0]["code"] == "first"